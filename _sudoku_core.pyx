@@ -0,0 +1,162 @@
+# cython: language_level=3
+"""
+Compiled core of the Sudoku solver (optional).
+
+Plain iterative MRV backtracking on C integers: candidates come from the
+row/column/box bitmasks, with no cand array and no propagation after each
+guess (unlike Sudoku._solve_fast). sudoku.py uses it automatically when it
+has been built:
+
+    python setup.py build_ext --inplace
+"""
+
+cimport cython
+from libc.stdint cimport uint8_t
+
+
+# Box index (0-8) of every cell, and set-bit count of every 9-bit mask
+cdef uint8_t BOX_OF[81]
+cdef uint8_t POPCNT[512]
+
+cdef int _n
+for _n in range(81):
+    BOX_OF[_n] = (_n // 27) * 3 + (_n % 9) // 3
+for _n in range(512):
+    POPCNT[_n] = bin(_n).count('1')
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline int _find_best(uint8_t* board, unsigned short* rmask, unsigned short* cmask,
+                           unsigned short* bmask, unsigned int* best_cand) nogil:
+    """
+    Find the empty cell with the fewest candidates, or -1 if there is none.
+    """
+    cdef int i, count
+    cdef int best = -1
+    cdef int best_count = 10
+    cdef unsigned int cand
+
+    for i in range(81):
+        if board[i] == 0:
+            cand = ~(rmask[i // 9] | cmask[i % 9] | bmask[BOX_OF[i]]) & 0x1FF
+            count = POPCNT[cand]
+            if count < best_count:
+                best = i
+                best_cand[0] = cand
+                best_count = count
+                # A dead end or a naked single can't be beaten
+                if count <= 1:
+                    break
+    return best
+
+
+cdef inline uint8_t _digit(unsigned int bit) nogil:
+    """
+    Convert a single-bit mask to its digit (bit 0 -> 1).
+    """
+    cdef uint8_t num = 0
+    while bit:
+        bit >>= 1
+        num += 1
+    return num
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef bint _search(uint8_t* cells, unsigned short* rmask, unsigned short* cmask,
+                  unsigned short* bmask) nogil:
+    """
+    Iterative backtracking search; undoes every placement on failure.
+    """
+    cdef int stack_pos[81]
+    cdef unsigned int stack_cand[81]
+    cdef int depth = 0
+    cdef int pos, nxt
+    cdef unsigned int bit, cand, nxt_cand
+
+    pos = _find_best(cells, rmask, cmask, bmask, &cand)
+    if pos < 0:
+        return True
+
+    while True:
+        if cand:
+            # Place the lowest untried candidate
+            bit = cand & -cand
+            cand ^= bit
+            cells[pos] = _digit(bit)
+            rmask[pos // 9] ^= bit
+            cmask[pos % 9] ^= bit
+            bmask[BOX_OF[pos]] ^= bit
+
+            nxt = _find_best(cells, rmask, cmask, bmask, &nxt_cand)
+            if nxt < 0:
+                return True
+
+            stack_pos[depth] = pos
+            stack_cand[depth] = cand
+            depth += 1
+            pos = nxt
+            cand = nxt_cand
+        else:
+            # No candidates left here, so undo the previous placement
+            if depth == 0:
+                return False
+
+            depth -= 1
+            pos = stack_pos[depth]
+            cand = stack_cand[depth]
+            bit = 1u << (cells[pos] - 1)
+            cells[pos] = 0
+            rmask[pos // 9] ^= bit
+            cmask[pos % 9] ^= bit
+            bmask[BOX_OF[pos]] ^= bit
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def solve(uint8_t[::1] board):
+    """
+    Solve a flat board of 81 cells (0 for empty) in place.
+
+    Args:
+        board: Writable buffer of 81 bytes, e.g. Sudoku.board
+
+    Returns:
+        True if solved, False if no solution exists (board left unchanged)
+
+    Raises:
+        ValueError: If board is not 81 cells of values 0-9
+    """
+    cdef unsigned short rmask[9]
+    cdef unsigned short cmask[9]
+    cdef unsigned short bmask[9]
+    cdef int i
+    cdef unsigned int bit
+    cdef bint solved
+    cdef uint8_t* cells
+
+    if board.shape[0] != 81:
+        raise ValueError("Board must have 81 cells")
+    cells = &board[0]
+
+    for i in range(9):
+        rmask[i] = 0
+        cmask[i] = 0
+        bmask[i] = 0
+
+    for i in range(81):
+        if cells[i]:
+            if cells[i] > 9:
+                raise ValueError(f"Invalid cell value {cells[i]} at position {i}")
+            bit = 1u << (cells[i] - 1)
+            rmask[i // 9] |= bit
+            cmask[i % 9] |= bit
+            bmask[BOX_OF[i]] |= bit
+
+    with nogil:
+        solved = _search(cells, rmask, cmask, bmask)
+    return solved
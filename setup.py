@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+Build script for the optional compiled solver core.
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+sudoku.py works without it and falls back to numba or pure Python.
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+
+setup(
+    name="sudoku-solver",
+    py_modules=["sudoku"],
+    ext_modules=cythonize(
+        [Extension("_sudoku_core", ["_sudoku_core.pyx"])],
+        compiler_directives={"language_level": "3"},
+    ),
+)
@@ -7,39 +7,196 @@ Supports solving puzzles, interactive play mode, and demonstrations.
 
 Author: Kartik Bisht (AI-assisted academic project)
 Python Version: 3.6+
-Dependencies: None (standard library only)
+Dependencies: None (standard library only); a compiled solver core is
+              used when built (see setup.py), else numba + numpy when
+              installed
 
 """
 
 import sys
 import time
 import json
-from typing import List, Optional, Tuple
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from _sudoku_core import solve as _c_solve
+except ImportError:
+    # The compiled core is optional; build it with setup.py
+    _c_solve = None
+
+# Numba is only a fallback for the compiled core, so skip its import cost
+# when the extension is available
+np = None
+njit = None
+if _c_solve is None:
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        # Numba is optional; without it the pure-Python solver is used
+        pass
+
+
+# Cells are numbered 0-80 in row-major order (index = row * 9 + col).
+# Box index (0-8) of every cell, so the hot path avoids integer division
+BOX_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+
+# The 27 units (9 rows, 9 columns, 9 boxes) as tuples of cell indices
+UNITS = (
+    [tuple(range(r * 9, r * 9 + 9)) for r in range(9)] +
+    [tuple(range(c, 81, 9)) for c in range(9)] +
+    [tuple(9 * (3 * (b // 3) + dr) + 3 * (b % 3) + dc for dr in range(3) for dc in range(3))
+     for b in range(9)]
+)
+
+# The 20 other cells sharing a row, column or box with each cell
+PEERS = [
+    tuple(sorted(set(UNITS[i // 9] + UNITS[9 + i % 9] + UNITS[18 + BOX_OF[i]]) - {i}))
+    for i in range(81)
+]
+
+# Number of set bits in every 9-bit candidate mask
+POPCNT = bytes(bin(i).count('1') for i in range(512))
+
+# Translation table for puzzle strings: '.' and '0'-'9' map to cell values
+# 0-9 and every other byte maps to 0xFF, which is rejected
+_DIGITS = bytes(
+    0 if b == ord('.') else b - ord('0') if ord('0') <= b <= ord('9') else 0xFF
+    for b in range(256)
+)
+
+# Maps cell values 0-9 back to the characters '0'-'9'
+_CHARS = bytes.maketrans(bytes(range(10)), b'0123456789')
+
+# Solvers generated by Sudoku.compile_specialized, keyed by (class, puzzle
+# bytes) and kept in least-recently-used order, up to _SPECIALIZED_MAX entries
+_SPECIALIZED_MAX = 256
+_SPECIALIZED: Dict[Tuple[type, bytes], Callable[[], Optional['Sudoku']]] = OrderedDict()
+
+# Display strings for cell values 0-9 and the grid lines used by pretty_print
+_CELL = [' . '] + [f' {d} ' for d in range(1, 10)]
+_HEADER = "    " + "   ".join(str(i) for i in range(9))
+_SEPARATOR = "  +" + "---+" * 9
+
+if njit is not None:
+    _BOX_OF = np.array(BOX_OF, dtype=np.int8)
+    _POPCNT = np.frombuffer(POPCNT, dtype=np.uint8)
+    
+    @njit(cache=True)
+    def _find_best_core(board, rmask, cmask, bmask, box_of, popcnt):
+        """
+        Numba version of Sudoku.find_best_empty on a flat board.
+        
+        Returns:
+            Tuple of (cell index, candidate bitmask), with index -1 if the
+            board has no empty cells
+        """
+        best = -1
+        best_cand = 0
+        best_count = 10
+        
+        for i in range(81):
+            if board[i] == 0:
+                cand = ~(rmask[i // 9] | cmask[i % 9] | bmask[box_of[i]]) & 0x1FF
+                count = popcnt[cand]
+                if count < best_count:
+                    best = i
+                    best_cand = cand
+                    best_count = count
+                    if count <= 1:
+                        break
+        return best, best_cand
+    
+    @njit(cache=True)
+    def _solve_core(board, rmask, cmask, bmask, box_of, popcnt):
+        """
+        Numba version of the iterative MRV backtracking solver.
+        
+        Args:
+            board: Flat np.int8 array of 81 cells, solved in place
+            rmask, cmask, bmask: np.int16 occupancy bitmasks, updated in place
+            box_of: np.int8 box index for every cell
+            popcnt: np.uint8 set-bit count for every 9-bit mask
+            
+        Returns:
+            True if solved, False if no solution exists (board left unchanged)
+        """
+        pos, cand = _find_best_core(board, rmask, cmask, bmask, box_of, popcnt)
+        if pos < 0:
+            return True
+        
+        stack_pos = np.empty(81, dtype=np.int64)
+        stack_cand = np.empty(81, dtype=np.int64)
+        depth = 0
+        
+        while True:
+            if cand:
+                bit = cand & -cand
+                cand ^= bit
+                num = 0
+                while bit >> num:
+                    num += 1
+                board[pos] = num
+                rmask[pos // 9] ^= bit
+                cmask[pos % 9] ^= bit
+                bmask[box_of[pos]] ^= bit
+                
+                nxt, nxt_cand = _find_best_core(board, rmask, cmask, bmask, box_of, popcnt)
+                if nxt < 0:
+                    return True
+                
+                stack_pos[depth] = pos
+                stack_cand[depth] = cand
+                depth += 1
+                pos = nxt
+                cand = nxt_cand
+            else:
+                if depth == 0:
+                    return False
+                
+                depth -= 1
+                pos = stack_pos[depth]
+                cand = stack_cand[depth]
+                bit = 1 << (board[pos] - 1)
+                board[pos] = 0
+                rmask[pos // 9] ^= bit
+                cmask[pos % 9] ^= bit
+                bmask[box_of[pos]] ^= bit
+else:
+    _solve_core = None
 
 
 class Sudoku:
     """
     Sudoku puzzle solver and validator.
     
-    The board is represented as a 9x9 list of lists where:
+    The board is represented as a flat bytearray of 81 cells in row-major
+    order (cell (row, col) is at index row * 9 + col) where:
     - 0 represents an empty cell
     - Numbers 1-9 represent filled cells
+    
+    Occupancy is also tracked as bitmasks, one int per row, column and box,
+    where bit d is set iff digit d+1 is present in that unit. The candidates
+    of every empty cell (bit d set iff digit d+1 may go there; 0 for filled
+    cells) are kept in the cand array and updated incrementally.
     """
     
+    __slots__ = ('board', 'original', 'rmask', 'cmask', 'bmask', 'cand')
+    
     def __init__(self, board: Optional[List[List[int]]] = None):
         """
         Initialize a Sudoku puzzle.
         
         Args:
             board: Optional 9x9 grid as list of lists. If None, creates empty board.
+            
+        Raises:
+            ValueError: If board dimensions are invalid or givens conflict
         """
-        if board is None:
-            self.board = [[0 for _ in range(9)] for _ in range(9)]
-        else:
-            self.load_board(board)
-        
-        # Store original cells to prevent modification during play mode
-        self.original = [[self.board[i][j] for j in range(9)] for i in range(9)]
+        self._load_cells(bytearray(81) if board is None else self._flatten(board))
     
     def load_board(self, board: List[List[int]]) -> None:
         """
@@ -49,14 +206,149 @@ class Sudoku:
             board: 9x9 grid as list of lists
             
         Raises:
-            ValueError: If board dimensions are invalid
+            ValueError: If board dimensions are invalid or givens conflict
         """
-        if len(board) != 9 or any(len(row) != 9 for row in board):
+        self._load_cells(self._flatten(board))
+    
+    @staticmethod
+    def _flatten(board: List[List[int]]) -> bytearray:
+        """
+        Copy a 9x9 grid into a flat bytearray of 81 cells.
+        
+        Raises:
+            ValueError: If board dimensions are invalid or a cell is not an
+                integer from 0 to 9
+        """
+        if (not isinstance(board, (list, tuple)) or len(board) != 9 or
+                any(not isinstance(row, (list, tuple)) or len(row) != 9 for row in board)):
             raise ValueError("Board must be 9x9")
         
-        # Deep copy to avoid reference issues
-        self.board = [[board[i][j] for j in range(9)] for i in range(9)]
-        self.original = [[board[i][j] for j in range(9)] for i in range(9)]
+        for i, row in enumerate(board):
+            for j, num in enumerate(row):
+                if not isinstance(num, int) or isinstance(num, bool) or not 0 <= num <= 9:
+                    raise ValueError(f"Invalid cell value {num!r} at ({i}, {j})")
+        
+        return bytearray(num for row in board for num in row)
+    
+    def _load_cells(self, cells: bytearray) -> None:
+        """
+        Load a flat board of 81 cell values, taking ownership of it.
+        
+        The original cells (kept to prevent modification during play mode)
+        are an immutable bytes copy of the board.
+        """
+        self.board = cells
+        self.original = bytes(cells)
+        self._init_masks()
+    
+    def _init_masks(self) -> None:
+        """
+        Build the occupancy bitmasks and cell candidates from the board.
+        
+        Raises:
+            ValueError: If two givens conflict
+        """
+        rmask = self.rmask = [0] * 9
+        cmask = self.cmask = [0] * 9
+        bmask = self.bmask = [0] * 9
+        
+        for i, num in enumerate(self.board):
+            if num:
+                bit = 1 << (num - 1)
+                if (rmask[i // 9] | cmask[i % 9] | bmask[BOX_OF[i]]) & bit:
+                    raise ValueError(f"Number {num} at ({i // 9}, {i % 9}) conflicts with another in its row, column or box")
+                rmask[i // 9] |= bit
+                cmask[i % 9] |= bit
+                bmask[BOX_OF[i]] |= bit
+        
+        cand = self.cand = array('H', [0] * 81)
+        for i, num in enumerate(self.board):
+            if num == 0:
+                cand[i] = ~(rmask[i // 9] | cmask[i % 9] | bmask[BOX_OF[i]]) & 0x1FF
+    
+    def get(self, row: int, col: int) -> int:
+        """
+        Get the number in a cell (0 if empty).
+        
+        Args:
+            row: Row index (0-8)
+            col: Column index (0-8)
+        """
+        return self.board[row * 9 + col]
+    
+    def set_cell(self, row: int, col: int, num: int) -> None:
+        """
+        Set a cell to num (0 clears it), keeping the bitmasks in sync.
+        
+        Only valid placements are accepted, so every digit on the board is
+        unique in its units and clearing a cell can safely drop its bit.
+        
+        Args:
+            row: Row index (0-8)
+            col: Column index (0-8)
+            num: Number to place (1-9), or 0 to clear the cell
+            
+        Raises:
+            ValueError: If num is out of range or conflicts with Sudoku rules
+        """
+        if not 0 <= num <= 9:
+            raise ValueError(f"Number must be between 0 and 9, got {num}")
+        if num and not self.is_valid(num, row, col):
+            raise ValueError(f"Placing {num} at ({row}, {col}) conflicts with its row, column or box")
+        
+        i = row * 9 + col
+        box = BOX_OF[i]
+        old = self.board[i]
+        if old:
+            bit = 1 << (old - 1)
+            self.rmask[row] ^= bit
+            self.cmask[col] ^= bit
+            self.bmask[box] ^= bit
+        if num:
+            bit = 1 << (num - 1)
+            self.rmask[row] |= bit
+            self.cmask[col] |= bit
+            self.bmask[box] |= bit
+        self.board[i] = num
+        
+        # Recompute candidates of the cell and every peer it can affect
+        rmask, cmask, bmask, cand = self.rmask, self.cmask, self.bmask, self.cand
+        for p in PEERS[i] + (i,):
+            cand[p] = 0 if self.board[p] else ~(rmask[p // 9] | cmask[p % 9] | bmask[BOX_OF[p]]) & 0x1FF
+    
+    def _place(self, i: int, bit: int) -> List[int]:
+        """
+        Fill empty cell index i with the digit for bit during solving.
+        
+        Returns:
+            The peers whose candidates lost bit, needed by _unplace
+        """
+        cand = self.cand
+        self.board[i] = bit.bit_length()
+        self.rmask[i // 9] ^= bit
+        self.cmask[i % 9] ^= bit
+        self.bmask[BOX_OF[i]] ^= bit
+        cand[i] = 0
+        
+        changed = [p for p in PEERS[i] if cand[p] & bit]
+        for p in changed:
+            cand[p] ^= bit
+        return changed
+    
+    def _unplace(self, i: int, changed: List[int]) -> None:
+        """
+        Clear cell index i, undoing a _place that returned changed.
+        """
+        cand = self.cand
+        bit = 1 << (self.board[i] - 1)
+        self.board[i] = 0
+        self.rmask[i // 9] ^= bit
+        self.cmask[i % 9] ^= bit
+        self.bmask[BOX_OF[i]] ^= bit
+        
+        for p in changed:
+            cand[p] |= bit
+        cand[i] = ~(self.rmask[i // 9] | self.cmask[i % 9] | self.bmask[BOX_OF[i]]) & 0x1FF
     
     @classmethod
     def from_string(cls, s: str) -> 'Sudoku':
@@ -70,7 +362,8 @@ class Sudoku:
             Sudoku instance
             
         Raises:
-            ValueError: If string length is not 81
+            ValueError: If string length is not 81, a character is invalid,
+                or givens conflict
         """
         # Remove whitespace and newlines
         s = ''.join(s.split())
@@ -78,37 +371,55 @@ class Sudoku:
         if len(s) != 81:
             raise ValueError(f"String must be 81 characters long, got {len(s)}")
         
-        board = []
-        for i in range(9):
-            row = []
-            for j in range(9):
-                char = s[i * 9 + j]
-                if char == '.' or char == '0':
-                    row.append(0)
-                elif char.isdigit() and 1 <= int(char) <= 9:
-                    row.append(int(char))
-                else:
-                    raise ValueError(f"Invalid character '{char}' at position {i*9+j}")
-            board.append(row)
+        # Convert to cell values in one pass; any other character becomes
+        # 0xFF (non-ASCII ones via '?'), one byte per character
+        data = s.encode('ascii', 'replace').translate(_DIGITS)
         
-        return cls(board)
+        if max(data) > 9:
+            pos = next(i for i, num in enumerate(data) if num > 9)
+            raise ValueError(f"Invalid character '{s[pos]}' at position {pos}")
+        
+        # Skip __init__ so the board is only built once
+        sudoku = cls.__new__(cls)
+        sudoku._load_cells(bytearray(data))
+        return sudoku
     
-    def find_empty(self) -> Optional[Tuple[int, int]]:
+    def to_string(self) -> str:
         """
-        Find the next empty cell (containing 0) in the board.
+        Convert the board to an 81-character string (0 for empty cells).
         
         Returns:
-            Tuple of (row, col) if empty cell found, None otherwise
+            String in the format accepted by from_string
         """
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    return (i, j)
-        return None
+        return self.board.translate(_CHARS).decode('ascii')
+    
+    def find_best_empty(self) -> Optional[Tuple[int, int]]:
+        """
+        Find the empty cell with the fewest legal candidates (MRV heuristic).
+        
+        Returns:
+            Tuple of (index, candidates) where index is row * 9 + col and
+            candidates is a bitmask with bit d set iff digit d+1 may be placed
+            there, or None if the board has no empty cells
+        """
+        cand = self.cand
+        best = None
+        best_count = 10
+        
+        for i, num in enumerate(self.board):
+            if num == 0:
+                count = POPCNT[cand[i]]
+                if count < best_count:
+                    best = (i, cand[i])
+                    best_count = count
+                    # A dead end or a naked single can't be beaten
+                    if count <= 1:
+                        return best
+        return best
     
     def is_valid(self, num: int, row: int, col: int) -> bool:
         """
-        Check if placing num at board[row][col] is valid according to Sudoku rules.
+        Check if placing num at (row, col) is valid according to Sudoku rules.
         
         Rules:
         1. Number must not exist in the same row
@@ -123,74 +434,395 @@ class Sudoku:
         Returns:
             True if move is valid, False otherwise
         """
-        # Check row
-        for j in range(9):
-            if self.board[row][j] == num and j != col:
-                return False
+        bit = 1 << (num - 1)
+        used = self.rmask[row] | self.cmask[col] | self.bmask[BOX_OF[row * 9 + col]]
         
-        # Check column
-        for i in range(9):
-            if self.board[i][col] == num and i != row:
-                return False
+        # The cell's own number doesn't conflict with itself
+        current = self.board[row * 9 + col]
+        if current:
+            used &= ~(1 << (current - 1))
         
-        # Check 3x3 box
-        box_row = (row // 3) * 3
-        box_col = (col // 3) * 3
-        
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if self.board[i][j] == num and (i, j) != (row, col):
-                    return False
-        
-        return True
+        return not used & bit
     
     def solve(self, show_steps: bool = False) -> bool:
         """
         Solve the Sudoku puzzle using backtracking algorithm.
         
         The backtracking algorithm works as follows:
-        1. Find an empty cell
-        2. Try numbers 1-9 in that cell
-        3. For each number, check if it's valid
-        4. If valid, place it and recursively solve the rest
-        5. If we get stuck, backtrack and try the next number
-        6. If all numbers fail, return False (no solution)
-        7. If no empty cells remain, puzzle is solved
+        1. Fill in every forced cell (see _propagate)
+        2. Find the empty cell with the fewest legal candidates
+        3. Place the lowest untried candidate and propagate again
+        4. If that leads to a contradiction, or a later cell has no candidates
+           left, backtrack and try the next candidate
+        5. If the first cell runs out of candidates, return False (no solution)
+        6. If no empty cells remain, puzzle is solved
+        
+        After the first propagation the search itself runs in one of four
+        specialised loops, chosen once up front: _solve_trace when printing
+        steps, the compiled _sudoku_core extension when it has been built,
+        the numba-compiled core when numba is installed, and _solve_fast
+        otherwise.
+        
+        The two compiled cores only run the initial propagation (done here
+        in Python); their search is plain MRV backtracking without the
+        per-guess _propagate in steps 3-4, trading pruning for raw speed.
         
         Args:
-            show_steps: If True, print board at each step (slow, for visualization)
+            show_steps: If True, print the starting board, the board once forced
+                cells are filled, and the board after every guess (slow, for
+                visualization)
             
         Returns:
-            True if solved, False if no solution exists
+            True if solved, False if no solution exists (board left unchanged)
         """
         if show_steps:
+            # Show the starting puzzle; _solve_trace then prints it again
+            # with the forced cells filled in
             self.pretty_print()
             print()
         
-        # Find the next empty cell
-        empty = self.find_empty()
+        forced = []
+        if not self._propagate(forced):
+            self._undo(forced)
+            return False
+        
+        if show_steps:
+            solved = self._solve_trace()
+        elif _c_solve is not None:
+            solved = self._solve_c()
+        elif _solve_core is not None:
+            solved = self._solve_numba()
+        else:
+            solved = self._solve_fast()
+        
+        if not solved:
+            self._undo(forced)
+        return solved
+    
+    @staticmethod
+    def solve_many(puzzles: List[str], workers: Optional[int] = None) -> List[Optional[str]]:
+        """
+        Solve many puzzles in parallel across worker processes.
+        
+        Args:
+            puzzles: Puzzle strings in any format accepted by from_string
+            workers: Number of worker processes (default: one per CPU)
+            
+        Returns:
+            List of 81-character solution strings in the same order as
+            puzzles, with None for puzzles that have no solution
+            
+        Raises:
+            ValueError: If a puzzle string is invalid
+        """
+        with ProcessPoolExecutor(workers) as executor:
+            # Large chunks amortize the inter-process overhead per puzzle
+            return list(executor.map(_solve_one_str, puzzles, chunksize=64))
+    
+    @classmethod
+    def compile_specialized(cls, puzzle: bytes) -> Callable[[], Optional['Sudoku']]:
+        """
+        Generate a solver function specialised for one set of givens.
+        
+        Useful when the same puzzle template is solved many times. The
+        givens are loaded, validated and propagated once, and the resulting
+        masks, candidates and first MRV cell are written into the generated
+        source as literals. Each call of the returned function therefore
+        starts directly at the first branch of the search. The most recently
+        used functions are cached per class and puzzle.
+        
+        Args:
+            puzzle: 81 bytes of cell values (0 for empty), e.g. Sudoku.original
+            
+        Returns:
+            Function taking no arguments that returns a new solved Sudoku,
+            or None if the puzzle has no solution
+            
+        Raises:
+            ValueError: If the puzzle is not 81 valid, non-conflicting cells
+        """
+        key = bytes(puzzle)
+        solver = _SPECIALIZED.get((cls, key))
+        if solver is not None:
+            _SPECIALIZED.move_to_end((cls, key))
+            return solver
+        
+        if len(key) != 81:
+            raise ValueError(f"Puzzle must be 81 cells long, got {len(key)}")
+        if max(key) > 9:
+            raise ValueError(f"Invalid cell value {max(key)} in puzzle")
+        
+        template = cls.__new__(cls)
+        template._load_cells(bytearray(key))
+        
+        lines = ["def solve_specialized():"]
+        if not template._propagate([]):
+            lines.append("    return None")
+        else:
+            lines += [
+                "    sudoku = Sudoku.__new__(Sudoku)",
+                f"    sudoku.board = bytearray({bytes(template.board)!r})",
+                f"    sudoku.original = {key!r}",
+                f"    sudoku.rmask = {template.rmask!r}",
+                f"    sudoku.cmask = {template.cmask!r}",
+                f"    sudoku.bmask = {template.bmask!r}",
+                f"    sudoku.cand = array('H', {template.cand.tolist()!r})",
+            ]
+            
+            # Pick the search loop now rather than on every call
+            first = template.find_best_empty()
+            if first is None:
+                lines.append("    return sudoku")
+            else:
+                if _c_solve is not None:
+                    lines.append("    solved = sudoku._solve_c()")
+                elif _solve_core is not None:
+                    lines.append("    solved = sudoku._solve_numba()")
+                else:
+                    lines.append(f"    solved = sudoku._solve_fast({first!r})")
+                lines.append("    return sudoku if solved else None")
+        
+        namespace = {'Sudoku': cls, 'array': array}
+        exec("\n".join(lines), namespace)
+        solver = _SPECIALIZED[(cls, key)] = namespace['solve_specialized']
+        if len(_SPECIALIZED) > _SPECIALIZED_MAX:
+            _SPECIALIZED.popitem(last=False)
+        return solver
+    
+    def _solve_fast(self, start: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Iterative backtracking search with propagation after every guess.
+        
+        Placed cells are kept on an explicit stack together with the
+        candidates not yet tried there and the trail of placements (its own
+        and those made by propagation) needed to undo it.
+        
+        The placement (_place) and the MRV scan (find_best_empty) are
+        inlined, and every attribute and global used in the loop is bound
+        to a local first.
+        
+        Args:
+            start: Optional (index, candidates) of the first cell to branch
+                on, as returned by find_best_empty, if already known
+            
+        Returns:
+            True if solved, False if no solution exists (search undone)
+        """
+        board, cand = self.board, self.cand
+        rmask, cmask, bmask = self.rmask, self.cmask, self.bmask
+        peers, box_of, popcnt = PEERS, BOX_OF, POPCNT
+        propagate, undo = self._propagate, self._undo
+        
+        empty = self.find_best_empty() if start is None else start
+        if empty is None:
+            return True
+        
+        stack = []
+        pos, untried = empty
+        
+        while True:
+            if untried:
+                # Place the lowest untried candidate
+                bit = untried & -untried
+                untried ^= bit
+                board[pos] = bit.bit_length()
+                rmask[pos // 9] ^= bit
+                cmask[pos % 9] ^= bit
+                bmask[box_of[pos]] ^= bit
+                cand[pos] = 0
+                changed = [p for p in peers[pos] if cand[p] & bit]
+                for p in changed:
+                    cand[p] ^= bit
+                
+                trail = [(pos, changed)]
+                if not propagate(trail):
+                    undo(trail)
+                    continue
+                
+                # Find the most constrained empty cell
+                best = -1
+                best_count = 10
+                for i in range(81):
+                    if board[i] == 0:
+                        count = popcnt[cand[i]]
+                        if count < best_count:
+                            best = i
+                            best_count = count
+                            if count <= 1:
+                                break
+                
+                if best < 0:
+                    return True
+                
+                stack.append((pos, untried, trail))
+                pos, untried = best, cand[best]
+            else:
+                # No candidates left here, so undo the previous placement
+                if not stack:
+                    return False
+                
+                pos, untried, trail = stack.pop()
+                undo(trail)
+    
+    def _solve_trace(self) -> bool:
+        """
+        Same search as _solve_fast, printing the board after every step.
+        
+        Returns:
+            True if solved, False if no solution exists (search undone)
+        """
+        self.pretty_print()
+        print()
         
-        # If no empty cells, puzzle is solved
+        empty = self.find_best_empty()
         if empty is None:
             return True
         
-        row, col = empty
+        stack = []
+        pos, cand = empty
         
-        # Try numbers 1-9
-        for num in range(1, 10):
-            if self.is_valid(num, row, col):
-                # Place the number
-                self.board[row][col] = num
+        while True:
+            if cand:
+                # Place the lowest untried candidate
+                bit = cand & -cand
+                cand ^= bit
+                trail = [(pos, self._place(pos, bit))]
+                if not self._propagate(trail):
+                    self._undo(trail)
+                    continue
+                
+                self.pretty_print()
+                print()
                 
-                # Recursively solve
-                if self.solve(show_steps):
+                empty = self.find_best_empty()
+                if empty is None:
                     return True
                 
-                # If didn't work, backtrack
-                self.board[row][col] = 0
+                stack.append((pos, cand, trail))
+                pos, cand = empty
+            else:
+                # No candidates left here, so undo the previous placement
+                if not stack:
+                    return False
+                
+                pos, cand, trail = stack.pop()
+                self._undo(trail)
+    
+    def _propagate(self, trail: List[Tuple[int, List[int]]]) -> bool:
+        """
+        Fill in forced cells until none are left.
+        
+        Repeatedly applies two rules:
+        - Naked single: an empty cell with only one candidate gets it
+        - Hidden single: a digit that fits only one cell of a unit goes there
+        
+        Args:
+            trail: List that every placement (cell index, changed peers) is
+                appended to, so the caller can undo them
+            
+        Returns:
+            False if a contradiction was found (a cell or a digit in some
+            unit with nowhere to go), True otherwise
+        """
+        board, cand = self.board, self.cand
+        place, peers = self._place, PEERS
+        
+        # Cells whose candidates may have changed since they were last checked
+        pending = list(range(81))
         
-        # No valid number found, trigger backtracking
-        return False
+        while pending:
+            # Naked singles: filling a cell only affects its peers
+            while pending:
+                i = pending.pop()
+                if board[i] == 0:
+                    c = cand[i]
+                    if not c:
+                        return False
+                    if not c & (c - 1):
+                        trail.append((i, place(i, c)))
+                        pending.extend(peers[i])
+            
+            # Hidden singles: track digits seen in one cell vs. several
+            for unit in UNITS:
+                once = twice = placed = 0
+                for i in unit:
+                    num = board[i]
+                    if num:
+                        placed |= 1 << (num - 1)
+                    else:
+                        c = cand[i]
+                        twice |= once & c
+                        once |= c
+                
+                if (once | placed) != 0x1FF:
+                    return False
+                
+                hidden = once & ~twice
+                while hidden:
+                    bit = hidden & -hidden
+                    hidden ^= bit
+                    for i in unit:
+                        if cand[i] & bit:
+                            trail.append((i, place(i, bit)))
+                            pending.extend(peers[i])
+                            break
+                    else:
+                        # Its only cell was just taken by another hidden single
+                        return False
+        
+        return True
+    
+    def _undo(self, trail: List[Tuple[int, List[int]]]) -> None:
+        """
+        Clear the cells recorded in trail, most recent first.
+        
+        Args:
+            trail: List of (cell index, changed peers) placements made
+                during solving
+        """
+        for i, changed in reversed(trail):
+            self._unplace(i, changed)
+    
+    def _solve_c(self) -> bool:
+        """
+        Solve using the compiled _sudoku_core extension.
+        
+        The extension solves the board buffer in place; the masks and
+        candidates are then rebuilt from the full board.
+        
+        Returns:
+            True if solved, False if no solution exists
+        """
+        if not _c_solve(self.board):
+            return False
+        
+        self._init_masks()
+        return True
+    
+    def _solve_numba(self) -> bool:
+        """
+        Solve using the numba-compiled core.
+        
+        The core works on a zero-copy view of the board; only the masks are
+        copied back (the cand array is not used by the core).
+        
+        Returns:
+            True if solved, False if no solution exists
+        """
+        board = np.frombuffer(self.board, dtype=np.int8)
+        rmask = np.array(self.rmask, dtype=np.int16)
+        cmask = np.array(self.cmask, dtype=np.int16)
+        bmask = np.array(self.bmask, dtype=np.int16)
+        
+        if not _solve_core(board, rmask, cmask, bmask, _BOX_OF, _POPCNT):
+            return False
+        
+        # The board is now full, so no cell has candidates left
+        self.rmask = rmask.tolist()
+        self.cmask = cmask.tolist()
+        self.bmask = bmask.tolist()
+        self.cand = array('H', [0] * 81)
+        return True
     
     def is_solved(self) -> bool:
         """
@@ -200,43 +832,28 @@ class Sudoku:
             True if solved, False otherwise
         """
         # Check no empty cells
-        if any(self.board[i][j] == 0 for i in range(9) for j in range(9)):
+        if 0 in self.board:
             return False
         
-        # Check all rows, columns, and boxes are valid
-        for i in range(9):
-            for j in range(9):
-                num = self.board[i][j]
-                self.board[i][j] = 0  # Temporarily remove
-                if not self.is_valid(num, i, j):
-                    self.board[i][j] = num
-                    return False
-                self.board[i][j] = num
-        
-        return True
+        # With all 81 cells filled, every row, column, and box is valid iff it
+        # contains all nine digits. The masks are kept in sync with the board,
+        # so this needs no scan of the cells.
+        return all(m == 0x1FF for m in self.rmask + self.cmask + self.bmask)
     
     def pretty_print(self) -> None:
         """
         Print the Sudoku board in a clean, readable format with grid lines.
         """
-        print("    " + "   ".join(str(i) for i in range(9)))
-        print("  +" + "---+" * 9)
+        board = self.board
+        print(_HEADER)
+        print(_SEPARATOR)
         
         for i in range(9):
-            row_str = f"{i} |"
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    row_str += " . "
-                else:
-                    row_str += f" {self.board[i][j]} "
-                
-                if (j + 1) % 3 == 0:
-                    row_str += "|"
-            
-            print(row_str)
+            c = [_CELL[num] for num in board[i * 9:(i + 1) * 9]]
+            print(f"{i} |" + c[0] + c[1] + c[2] + "|" + c[3] + c[4] + c[5] + "|" + c[6] + c[7] + c[8] + "|")
             
             if (i + 1) % 3 == 0:
-                print("  +" + "---+" * 9)
+                print(_SEPARATOR)
     
     def get_hint(self) -> Optional[Tuple[int, int, int]]:
         """
@@ -245,25 +862,33 @@ class Sudoku:
         Returns:
             Tuple of (row, col, num) for a valid move, or None if no hints available
         """
+        cand = self.cand
+        
         # Try to find an empty cell with only one possibility
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    valid_nums = [num for num in range(1, 10) if self.is_valid(num, i, j)]
-                    if len(valid_nums) == 1:
-                        return (i, j, valid_nums[0])
+        # (filled cells have no candidates, so they never match)
+        for i in range(81):
+            if POPCNT[cand[i]] == 1:
+                return (i // 9, i % 9, cand[i].bit_length())
         
-        # If no single possibility, return any valid move
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    for num in range(1, 10):
-                        if self.is_valid(num, i, j):
-                            return (i, j, num)
+        # If no single possibility, return the lowest valid number anywhere
+        for i in range(81):
+            if cand[i]:
+                return (i // 9, i % 9, (cand[i] & -cand[i]).bit_length())
         
         return None
 
 
+def _solve_one_str(puzzle: str) -> Optional[str]:
+    """
+    Solve one puzzle string; module-level so worker processes can pickle it.
+    
+    Returns:
+        The solution as an 81-character string, or None if unsolvable
+    """
+    sudoku = Sudoku.from_string(puzzle)
+    return sudoku.to_string() if sudoku.solve() else None
+
+
 def load_puzzle_from_file(filename: str) -> Sudoku:
     """
     Load a Sudoku puzzle from a file.
@@ -405,13 +1030,13 @@ def play_mode() -> None:
                     continue
                 
                 # Check if cell is original (cannot be changed)
-                if sudoku.original[row][col] != 0:
+                if sudoku.original[row * 9 + col] != 0:
                     print("✗ Cannot change original puzzle numbers")
                     continue
                 
                 # Check if move is valid
                 if sudoku.is_valid(num, row, col):
-                    sudoku.board[row][col] = num
+                    sudoku.set_cell(row, col, num)
                     print("\n✓ Valid move!\n")
                     sudoku.pretty_print()
                 else:
@@ -454,10 +1079,18 @@ def demo_mode() -> None:
         print("\n✗ No solution exists.")
 
 
-def run_tests() -> None:
+def run_tests(filename: Optional[str] = None) -> None:
     """
     Run test cases with three sample puzzles of varying difficulty.
+    
+    Args:
+        filename: Optional file of puzzles, one per line. If given, every
+            puzzle in it is solved in parallel instead of the samples.
     """
+    if filename is not None:
+        run_corpus_tests(filename)
+        return
+    
     print("=" * 50)
     print("SUDOKU SOLVER - Test Suite")
     print("=" * 50)
@@ -504,6 +1137,77 @@ def run_tests() -> None:
             print(f"\n✗ Failed to solve after {elapsed:.4f} seconds")
 
 
+def run_corpus_tests(filename: str) -> None:
+    """
+    Solve every puzzle in a file in parallel and verify the solutions.
+    
+    Blank lines and lines starting with # are skipped. Malformed puzzles
+    are reported with their line number and left out of the run.
+    
+    Args:
+        filename: Path to a file with one 81-character puzzle per line
+    """
+    print("=" * 50)
+    print("SUDOKU SOLVER - Corpus Test")
+    print("=" * 50)
+    
+    puzzles = []
+    givens_list = []
+    bad_lines = 0
+    try:
+        with open(filename, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                
+                # Validate here so one bad line can't abort the whole run
+                try:
+                    givens_list.append(Sudoku.from_string(line).original)
+                except ValueError as e:
+                    print(f"✗ Line {line_no}: {e}")
+                    bad_lines += 1
+                    continue
+                puzzles.append(line)
+    except FileNotFoundError:
+        print(f"Error: File '{filename}' not found")
+        sys.exit(1)
+    
+    print(f"\nSolving {len(puzzles)} puzzles...")
+    start_time = time.time()
+    
+    solutions = Sudoku.solve_many(puzzles)
+    
+    elapsed = time.time() - start_time
+    
+    unsolved = 0
+    invalid = 0
+    for givens, solution in zip(givens_list, solutions):
+        if solution is None:
+            unsolved += 1
+            continue
+        
+        try:
+            sudoku = Sudoku.from_string(solution)
+        except ValueError:
+            invalid += 1
+            continue
+        
+        if not sudoku.is_solved() or any(g and g != num for g, num in zip(givens, sudoku.board)):
+            invalid += 1
+    
+    solved = len(puzzles) - unsolved
+    print(f"\n✓ Solved {solved}/{len(puzzles)} puzzles in {elapsed:.4f} seconds")
+    if bad_lines:
+        print(f"✗ {bad_lines} malformed puzzles were skipped")
+    if unsolved:
+        print(f"✗ {unsolved} puzzles have no solution")
+    if invalid:
+        print(f"✗ Verification: {invalid} solutions are INVALID")
+    else:
+        print("✓ Verification: All solutions are valid")
+
+
 def print_help() -> None:
     """
     Print help information and usage examples.
@@ -518,13 +1222,19 @@ ALGORITHM EXPLANATION
 ---------------------
 This program uses the Backtracking algorithm to solve Sudoku puzzles:
 
-1. Find an empty cell in the puzzle
-2. Try placing numbers 1-9 in that cell
-3. For each number, check if it's valid (no conflicts in row/column/box)
-4. If valid, place the number and recursively solve the rest of the puzzle
-5. If we can't solve with that number, remove it and try the next number
-6. If all numbers fail, backtrack to the previous cell and try a different number
-7. If no empty cells remain, the puzzle is solved!
+1. Find the empty cell with the fewest valid numbers (most constrained)
+2. Try placing each number that has no conflicts in its row/column/box
+3. Place the number, remember the cell on a stack, and move on to the next cell
+4. If we can't solve with that number, remove it and try the next number
+5. If all numbers fail, backtrack to the previous cell and try a different number
+6. If no empty cells remain, the puzzle is solved!
+
+Before and after every guess, forced cells are filled in first: cells with
+only one valid number (naked singles) and numbers that fit in only one cell
+of a row, column or box (hidden singles). Many puzzles need no guessing.
+
+Row, column and box contents are tracked as bitmasks, so checking a move
+or listing a cell's valid numbers takes a few integer operations.
 
 TIME COMPLEXITY
 ---------------
@@ -549,6 +1259,9 @@ Run demonstration:
 Run test suite:
     python sudoku.py --test
 
+Solve and verify every puzzle in a file (one per line), in parallel:
+    python sudoku.py --test puzzles.txt
+
 Show this help:
     python sudoku.py --help
 
@@ -619,7 +1332,7 @@ def main():
         demo_mode()
     
     elif command == '--test':
-        run_tests()
+        run_tests(sys.argv[2] if len(sys.argv) > 2 else None)
     
     else:
         print(f"Error: Unknown command '{command}'")